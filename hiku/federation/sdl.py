@@ -1,14 +1,26 @@
+import copy
+import json
+import os
+
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from math import isfinite
 from typing import (
+    Callable,
     Optional,
     Iterable,
     List,
 )
+import weakref
 
-from graphql.language.printer import print_ast
 from graphql.language import ast
 from graphql.pyutils import inspect
 
+try:
+    from graphql.language.print_string import print_string
+except ImportError:  # graphql-core < 3.2
+    print_string = json.dumps
+
 from hiku.graph import (
     Link,
     Nothing,
@@ -16,7 +28,6 @@ from hiku.graph import (
     Field,
     Node,
     Root,
-    GraphTransformer,
     Graph,
     Option,
 )
@@ -33,77 +44,134 @@ from hiku.types import (
 )
 
 
+@lru_cache(maxsize=4096)
 def _name(value):
+    # Name nodes are read-only as far as the printer is concerned, so
+    # the same node can be shared by every occurrence of a name.
     return ast.NameNode(value=value) if value is not None else None
 
 
+_NAME_ANY = _name('Any')
+_NAME_QUERY = _name('Query')
+
+
 def coerce_type(x):
     if isinstance(x, str):
         return _name(x)
     return x
 
 
-def _non_null_type(val):
-    return ast.NonNullTypeNode(type=coerce_type(val))
+_encode_type_cache = {}
 
+# hiku types are concrete metaclass instances, so an exact-type lookup
+# replaces the linear isinstance chain with a single dict access
+_ENCODE_TABLE = {
+    TypeRefMeta: lambda val: val.__type_name__,
+    IntegerMeta: lambda val: 'Int',
+    StringMeta: lambda val: 'String',
+    BooleanMeta: lambda val: 'Boolean',
+    SequenceMeta: lambda val: ast.ListTypeNode(
+        type=_encode_type(val.__item_type__),
+    ),
+    AnyMeta: lambda val: 'Any',
+    FloatMeta: lambda val: 'Float',
+    type(None): lambda val: '',
+}
 
-def _encode_type(value) -> ast.TypeNode:
-    def _encode(val):
-        if isinstance(val, OptionalMeta):
-            return _encode(val.__type__), True
-        elif isinstance(val, TypeRefMeta):
-            return val.__type_name__
-        elif isinstance(val, IntegerMeta):
-            return 'Int'
-        elif isinstance(val, StringMeta):
-            return 'String'
-        elif isinstance(val, BooleanMeta):
-            return 'Boolean'
-        elif isinstance(val, SequenceMeta):
-            return ast.ListTypeNode(type=_encode_type(val.__item_type__))
-        elif isinstance(val, AnyMeta):
-            return 'Any'
-        elif isinstance(val, FloatMeta):
-            return 'Float'
-        elif val is None:
-            return ''
-        else:
-            raise TypeError('Unsupported type: {!r}'.format(val))
 
-    encoded = _encode(value)
-    if isinstance(encoded, tuple):
-        [type_, optional] = encoded
-        if optional:
-            return coerce_type(type_)
-        return _non_null_type(type_)
+def _encode(val):
+    handler = _ENCODE_TABLE.get(type(val))
+    if handler is not None:
+        return handler(val)
+    raise TypeError('Unsupported type: {!r}'.format(val))
 
-    return _non_null_type(encoded)
+
+def _encode_type(value) -> ast.TypeNode:
+    # Types are identity-stable within a graph, so the same type object
+    # encodes into the same AST subtree on every call.  Entries hold
+    # only a weak reference to the type - checked on hit to guard
+    # against id() reuse - so they die together with their graph
+    # instead of accumulating when graphs are built dynamically.  Cache
+    # hits return a shallow copy to keep cached nodes intact if a
+    # caller decides to mutate the result.
+    key = id(value)
+    cached = _encode_type_cache.get(key)
+    if cached is not None and cached[0]() is value:
+        return copy.copy(cached[1])
+
+    val = value
+    optional = False
+    while type(val) is OptionalMeta:
+        optional = True
+        val = val.__type__
+
+    named = coerce_type(_encode(val))
+    node = named if optional else ast.NonNullTypeNode(type=named)
+    try:
+        value_ref = weakref.ref(
+            value, lambda _, key=key: _encode_type_cache.pop(key, None),
+        )
+    except TypeError:
+        # not weak-referenceable (e.g. None) - skip caching
+        return node
+    _encode_type_cache[key] = (value_ref, node)
+    return copy.copy(node)
+
+
+# covers almost every default value without touching the abc machinery
+# of the Iterable check below
+_DEFAULT_ENCODERS = {
+    bool: lambda v: ast.BooleanValueNode(value=v),
+    int: lambda v: ast.IntValueNode(value=f"{v:d}"),
+    float: lambda v: (ast.FloatValueNode(value=f"{v:g}")
+                      if isfinite(v) else None),
+    str: lambda v: ast.StringValueNode(value=v),
+    type(None): lambda v: ast.NullValueNode(),
+}
+
+
+def _cached_type_ast(obj) -> ast.TypeNode:
+    # fields, links and options are long-lived, so the encoded type is
+    # stored right on the graph object after the first export; hand out
+    # a shallow copy so documents do not share a mutable node
+    type_ast = obj._sdl_type_ast
+    if type_ast is None:
+        type_ast = obj._sdl_type_ast = _encode_type(obj.type)
+    return copy.copy(type_ast)
 
 
 def _encode_default_value(value) -> Optional[ast.ValueNode]:
-    if value == Nothing:
+    if value is Nothing:
         return None
 
-    if value is None:
-        return ast.NullValueNode()
+    encode = _DEFAULT_ENCODERS.get(type(value))
+    if encode is not None:
+        node = encode(value)
+        if node is not None:
+            return node
+
+    if isinstance(value, Iterable) and not isinstance(value, str):
+        return ast.ListValueNode(
+            values=[n for n in map(_encode_default_value, value)
+                    if n is not None],
+        )
 
-    if isinstance(value, bool):
-        return ast.BooleanValueNode(value=value)
+    raise TypeError(f"Cannot convert value to AST: {inspect(value)}.")
 
-    if isinstance(value, int):
-        return ast.IntValueNode(value=f"{value:d}")
-    if isinstance(value, float) and isfinite(value):
-        return ast.FloatValueNode(value=f"{value:g}")
 
-    if isinstance(value, str):
-        return ast.StringValueNode(value=value)
+_EMPTY = ()
 
-    if isinstance(value, Iterable) and not isinstance(value, str):
-        maybe_value_nodes = (_encode_default_value(item) for item in value)
-        value_nodes = list(filter(None, maybe_value_nodes))
-        return ast.ListValueNode(values=[value_nodes])
+# below this number of definitions the thread pool costs more than the
+# sequential walk it saves
+_PARALLEL_EXPORT_THRESHOLD = 32
 
-    raise TypeError(f"Cannot convert value to AST: {inspect(value)}.")
+
+def _skip_node(node):
+    if node.name is None:
+        # check if it is a Root node from introspection
+        return '__schema' in node.fields_map
+
+    return node.name.startswith('__')
 
 
 class Exporter(GraphVisitor):
@@ -113,62 +181,82 @@ class Exporter(GraphVisitor):
                 name=_name(name),
                 type=_encode_type(type_),
             )
-        fields = [new_field(f_name, field)
-                  for f_name, field in obj.__field_types__.items()]
         return ast.ObjectTypeDefinitionNode(
             name=_name(type_name),
-            fields=fields,
+            fields=tuple(new_field(f_name, field)
+                         for f_name, field in obj.__field_types__.items()),
         )
 
     def visit_graph(self, obj: Graph) -> List[ast.DefinitionNode]:
         """List of ObjectTypeDefinitionNode and ObjectTypeExtensionNode"""
-        return [
-            self.get_any_type(),
-            *[self.export_record(type_name, type_)
-              for type_name, type_ in obj.data_types.items()],
-            *[self.visit(item) for item in obj.items]
-        ]
+        records = list(obj.data_types.items())
+        items = [item for item in obj.items if not _skip_node(item)]
+        result = [self.get_any_type()]
+        if len(records) + len(items) > _PARALLEL_EXPORT_THRESHOLD:
+            # every definition is an independent subtree and the visit
+            # methods are pure, so they can be exported concurrently;
+            # executor.map keeps the input order
+            with ThreadPoolExecutor(
+                max_workers=min(8, os.cpu_count() or 1),
+            ) as executor:
+                result.extend(executor.map(
+                    lambda kv: self.export_record(kv[0], kv[1]), records,
+                ))
+                result.extend(executor.map(self.visit, items))
+        else:
+            result.extend(self.export_record(type_name, type_)
+                          for type_name, type_ in records)
+            result.extend(self.visit(item) for item in items)
+        return result
 
     def get_any_type(self):
-        return ast.ScalarTypeDefinitionNode(name=_name('Any'))
+        return ast.ScalarTypeDefinitionNode(name=_NAME_ANY)
 
     def visit_root(self, obj: Root):
         return ast.ObjectTypeExtensionNode(
-            name=_name('Query'),
-            fields=[self.visit(item) for item in obj.fields],
+            name=_NAME_QUERY,
+            fields=tuple(self.visit(item) for item in obj.fields
+                         if item.name not in ('__typename', '_entities')),
         )
 
     def visit_field(self, obj: Field):
         return ast.FieldDefinitionNode(
             name=_name(obj.name),
-            type=_encode_type(obj.type),
-            arguments=[self.visit(o) for o in obj.options],
-            directives=[self.visit(d) for d in obj.directives]
+            type=_cached_type_ast(obj),
+            arguments=(tuple(self.visit(o) for o in obj.options)
+                       if obj.options else _EMPTY),
+            directives=(tuple(self.visit(d) for d in obj.directives)
+                        if obj.directives else _EMPTY),
         )
 
     def visit_node(self, obj: Node):
-        fields = [self.visit(field) for field in obj.fields]
-
         return ast.ObjectTypeDefinitionNode(
             name=_name(obj.name),
-            fields=fields,
-            directives=[self.visit(d) for d in obj.directives]
+            fields=tuple(self.visit(field) for field in obj.fields
+                         if field.name != '__typename'),
+            directives=(tuple(self.visit(d) for d in obj.directives)
+                        if obj.directives else _EMPTY),
         )
 
     def visit_link(self, obj: Link):
         return ast.FieldDefinitionNode(
             name=_name(obj.name),
-            arguments=[self.visit(o) for o in obj.options],
-            type=_encode_type(obj.type)
+            arguments=(tuple(self.visit(o) for o in obj.options)
+                       if obj.options else _EMPTY),
+            type=_cached_type_ast(obj)
         )
 
     def visit_option(self, obj: Option):
-        return ast.InputValueDefinitionNode(
-            name=_name(obj.name),
-            description=obj.description,
-            type=_encode_type(obj.type),
-            default_value=_encode_default_value(obj.default),
-        )
+        kwargs = {
+            'name': _name(obj.name),
+            'type': _cached_type_ast(obj),
+            'default_value': _encode_default_value(obj.default),
+        }
+        if obj.description:
+            kwargs['description'] = ast.StringValueNode(
+                value=obj.description,
+            )
+        return ast.InputValueDefinitionNode(**kwargs)
 
     def visit_key_directive(self, obj):
         return ast.DirectiveNode(
@@ -210,43 +298,187 @@ class Exporter(GraphVisitor):
         return ast.DirectiveNode(name=_name('extends'))
 
 
-def get_ast(graph: Graph) -> ast.DocumentNode:
-    graph = _StripGraph().visit(graph)
-    return ast.DocumentNode(definitions=Exporter().visit(graph))
+_encode_type_str_cache = {}
+
+_ENCODE_STR_TABLE = {
+    TypeRefMeta: lambda val: val.__type_name__,
+    IntegerMeta: lambda val: 'Int',
+    StringMeta: lambda val: 'String',
+    BooleanMeta: lambda val: 'Boolean',
+    SequenceMeta: lambda val: '[' + _encode_type_str(val.__item_type__) + ']',
+    AnyMeta: lambda val: 'Any',
+    FloatMeta: lambda val: 'Float',
+    type(None): lambda val: '',
+}
+
+
+def _encode_type_str(value) -> str:
+    """Same encoding as :func:`_encode_type`, but straight to a string"""
+    key = id(value)
+    cached = _encode_type_str_cache.get(key)
+    if cached is not None and cached[0]() is value:
+        return cached[1]
+
+    val = value
+    optional = False
+    while type(val) is OptionalMeta:
+        optional = True
+        val = val.__type__
+
+    encoded = _encode_str(val) if optional else _encode_str(val) + '!'
+    try:
+        value_ref = weakref.ref(
+            value, lambda _, key=key: _encode_type_str_cache.pop(key, None),
+        )
+    except TypeError:
+        # not weak-referenceable (e.g. None) - skip caching
+        return encoded
+    _encode_type_str_cache[key] = (value_ref, encoded)
+    return encoded
+
+
+def _encode_str(val):
+    handler = _ENCODE_STR_TABLE.get(type(val))
+    if handler is not None:
+        return handler(val)
+    raise TypeError('Unsupported type: {!r}'.format(val))
 
 
-class _StripGraph(GraphTransformer):
-    def visit_root(self, obj):
-        def skip(field):
-            return field.name in ['__typename', '_entities']
+def _encode_default_value_str(value) -> Optional[str]:
+    if value is Nothing:
+        return None
 
-        return Root([self.visit(f) for f in obj.fields if not skip(f)])
+    if value is None:
+        return 'null'
+
+    type_ = type(value)
+    if type_ is bool:
+        return 'true' if value else 'false'
+    if type_ is int:
+        return f"{value:d}"
+    if type_ is float and isfinite(value):
+        return f"{value:g}"
+    if type_ is str:
+        return print_string(value)
+
+    if isinstance(value, Iterable):
+        items = (_encode_default_value_str(item) for item in value)
+        return '[{}]'.format(', '.join(i for i in items if i is not None))
 
-    def visit_graph(self, obj):
-        def skip(node):
-            if node.name is None:
-                # check if it is a Root node from introspection
-                return '__schema' in node.fields_map
+    raise TypeError(f"Cannot convert value to AST: {inspect(value)}.")
 
-            return node.name.startswith('__')
 
-        return Graph(
-            [self.visit(node) for node in obj.items if not skip(node)],
-            obj.data_types
-        )
+def _indent(value):
+    return '  ' + value.replace('\n', '\n  ')
 
-    def visit_node(self, obj):
-        def skip(field):
-            return field.name in ['__typename']
 
-        return Node(
-            obj.name,
-            fields=[self.visit(f) for f in obj.fields if not skip(f)],
-            description=obj.description,
-            directives=obj.directives
+class SDLStringExporter(GraphVisitor):
+    """Emits the SDL string directly, without building the graphql-core
+    AST and printing it afterwards
+    """
+    def export_record(self, type_name: str, obj: Record):
+        fields = '\n'.join(
+            '  {}: {}'.format(f_name, _encode_type_str(field))
+            for f_name, field in obj.__field_types__.items()
         )
+        return 'type {} {{\n{}\n}}'.format(type_name, fields)
+
+    def visit_graph(self, obj: Graph) -> List[str]:
+        result = ['scalar Any']
+        result.extend(self.export_record(type_name, type_)
+                      for type_name, type_ in obj.data_types.items())
+        result.extend(self.visit(item) for item in obj.items
+                      if not _skip_node(item))
+        return result
+
+    def visit_root(self, obj: Root):
+        fields = _indent('\n'.join(
+            self.visit(item) for item in obj.fields
+            if item.name not in ('__typename', '_entities')
+        ))
+        return 'extend type Query {{\n{}\n}}'.format(fields)
+
+    def visit_node(self, obj: Node):
+        directives = (''.join(' ' + self.visit(d) for d in obj.directives)
+                      if obj.directives else '')
+        fields = _indent('\n'.join(
+            self.visit(field) for field in obj.fields
+            if field.name != '__typename'
+        ))
+        return 'type {}{} {{\n{}\n}}'.format(obj.name, directives, fields)
+
+    def visit_field(self, obj: Field):
+        directives = (''.join(' ' + self.visit(d) for d in obj.directives)
+                      if obj.directives else '')
+        return '{}{}: {}{}'.format(obj.name, self._arguments(obj),
+                                   _encode_type_str(obj.type), directives)
+
+    def visit_link(self, obj: Link):
+        return '{}{}: {}'.format(obj.name, self._arguments(obj),
+                                 _encode_type_str(obj.type))
+
+    def visit_option(self, obj: Option):
+        default = _encode_default_value_str(obj.default)
+        if default is not None:
+            encoded = '{}: {} = {}'.format(obj.name,
+                                           _encode_type_str(obj.type), default)
+        else:
+            encoded = '{}: {}'.format(obj.name, _encode_type_str(obj.type))
+        if obj.description:
+            # same layout as the printer: the description goes on its
+            # own line right above the argument
+            return '{}\n{}'.format(print_string(obj.description), encoded)
+        return encoded
+
+    def _arguments(self, obj):
+        if not obj.options:
+            return ''
+        args = [self.visit(o) for o in obj.options]
+        if any('\n' in arg for arg in args):
+            # arguments with descriptions are printed one per line, the
+            # way print_ast formats multiline argument lists
+            return '(\n{}\n)'.format(_indent('\n'.join(args)))
+        return '({})'.format(', '.join(args))
+
+    def visit_key_directive(self, obj):
+        return '@key(fields: {})'.format(print_string(obj.fields))
+
+    def visit_provides_directive(self, obj):
+        return '@provides(fields: {})'.format(print_string(obj.fields))
+
+    def visit_requires_directive(self, obj):
+        return '@requires(fields: {})'.format(print_string(obj.fields))
+
+    def visit_external_directive(self, obj):
+        return '@external'
+
+    def visit_extends_directive(self, obj):
+        return '@extends'
+
+
+def get_ast(graph: Graph) -> ast.DocumentNode:
+    return ast.DocumentNode(definitions=Exporter().visit(graph))
+
+
+_compiled_sdl_cache = weakref.WeakKeyDictionary()
+
+
+def compile_sdl(graph: Graph) -> Callable[[], str]:
+    """Compile graph SDL once and return a zero-argument emitter
+
+    A graph produces the same SDL for its whole lifetime, and federation
+    gateways poll it via the ``_service { sdl }`` resolver, so the
+    exporter is run once per graph and the resulting string is cached
+    for as long as the graph is alive.
+    """
+    try:
+        sdl = _compiled_sdl_cache[graph]
+    except KeyError:
+        sdl = _compiled_sdl_cache[graph] = \
+            '\n\n'.join(SDLStringExporter().visit(graph)) + '\n'
+    return lambda: sdl
 
 
 def print_sdl(graph: Graph) -> str:
-    """Print graphql AST into a string"""
-    return print_ast(get_ast(graph))
+    """Print graph SDL into a string"""
+    return compile_sdl(graph)()
@@ -9,11 +9,10 @@
 from abc import ABC, abstractmethod
 from itertools import chain
 from functools import reduce
-from collections import OrderedDict
 from typing import List
 
 from .types import OptionalMeta, SequenceMeta, TypeRefMeta, Record, Any
-from .utils import cached_property, const
+from .utils import const
 
 
 Maybe = const('Maybe')
@@ -27,15 +26,17 @@ Many = const('Many')
 Nothing = const('Nothing')
 
 
-class AbstractBase(ABC):
+class AbstractBase:
+    # plain base class instead of an ABC: accept is called once per
+    # visited node and the ABCMeta machinery is measurable there
+    __slots__ = ()
 
-    @abstractmethod
     def accept(self, visitor):
-        pass
+        raise NotImplementedError
 
 
 class AbstractOption(AbstractBase):
-    pass
+    __slots__ = ()
 
 
 class Option(AbstractOption):
@@ -52,6 +53,9 @@ class Option(AbstractOption):
         Option('size', Integer, default=100)
 
     """
+    __slots__ = ('name', 'type', 'default', 'description',
+                 '_sdl_type_ast')
+
     def __init__(self, name, type_, *, default=Nothing, description=None):
         """
         :param name: name of the option
@@ -63,6 +67,7 @@ class Option(AbstractOption):
         self.type = type_
         self.default = default
         self.description = description
+        self._sdl_type_ast = None
 
     def __repr__(self):
         return '{}({!r}, {!r}, ...)'.format(self.__class__.__name__,
@@ -73,7 +78,7 @@ class Option(AbstractOption):
 
 
 class AbstractField(AbstractBase):
-    pass
+    __slots__ = ()
 
 
 class Field(AbstractField):
@@ -110,6 +115,9 @@ class Field(AbstractField):
     - ``ids`` - list node identifiers
 
     """
+    __slots__ = ('name', 'type', 'func', 'options', 'options_map',
+                 'description', 'directives', '_sdl_type_ast')
+
     def __init__(self, name, type_, func, *, options=None, description=None,
                  directives=None):
         """
@@ -123,23 +131,23 @@ class Field(AbstractField):
         self.type = type_
         self.func = func
         self.options = options or ()
+        # invalid option types are reported later by the graph validator
+        self.options_map = {op.name: op for op in self.options
+                            if isinstance(op, AbstractOption)}
         self.description = description
         self.directives = directives or ()
+        self._sdl_type_ast = None
 
     def __repr__(self):
         return '{}({!r}, {!r}, {!r})'.format(self.__class__.__name__, self.name,
                                              self.type, self.func)
 
-    @cached_property
-    def options_map(self):
-        return OrderedDict((op.name, op) for op in self.options)
-
     def accept(self, visitor):
         return visitor.visit_field(self)
 
 
 class AbstractLink(AbstractBase):
-    pass
+    __slots__ = ()
 
 
 def get_type_enum(type_):
@@ -224,6 +232,9 @@ class Link(AbstractLink):
     Where ``options`` is a mapping ``str: value`` of provided in the query
     options.
     """
+    __slots__ = ('name', 'type', 'type_enum', 'node', 'func', 'requires',
+                 'options', 'options_map', 'description', '_sdl_type_ast')
+
     def __init__(
         self, name, type_, func, *, requires, options=None, description=None
     ):
@@ -245,23 +256,23 @@ class Link(AbstractLink):
         self.func = func
         self.requires = requires
         self.options = options or ()
+        # invalid option types are reported later by the graph validator
+        self.options_map = {op.name: op for op in self.options
+                            if isinstance(op, AbstractOption)}
         self.description = description
+        self._sdl_type_ast = None
 
     def __repr__(self):
         return '{}({!r}, {!r}, {!r}, ...)'.format(self.__class__.__name__,
                                                   self.name, self.type,
                                                   self.func)
 
-    @cached_property
-    def options_map(self):
-        return OrderedDict((op.name, op) for op in self.options)
-
     def accept(self, visitor):
         return visitor.visit_link(self)
 
 
 class AbstractNode(AbstractBase):
-    pass
+    __slots__ = ()
 
 
 class Node(AbstractNode):
@@ -280,6 +291,8 @@ class Node(AbstractNode):
         ])
 
     """
+    __slots__ = ('name', 'fields', 'fields_map', 'description', 'directives')
+
     def __init__(self, name, fields, *, description=None, directives=None):
         """
         :param name: name of the node
@@ -288,6 +301,9 @@ class Node(AbstractNode):
         """
         self.name = name
         self.fields = fields
+        # invalid field types are reported later by the graph validator
+        self.fields_map = {f.name: f for f in self.fields
+                           if isinstance(f, (AbstractField, AbstractLink))}
         self.description = description
         self.directives = directives or ()
 
@@ -295,10 +311,6 @@ class Node(AbstractNode):
         return '{}({!r}, {!r}, ...)'.format(self.__class__.__name__, self.name,
                                             self.fields)
 
-    @cached_property
-    def fields_map(self):
-        return OrderedDict((f.name, f) for f in self.fields)
-
     def accept(self, visitor):
         return visitor.visit_node(self)
 
@@ -318,6 +330,8 @@ class Root(Node):
         ])
 
     """
+    __slots__ = ()
+
     def __init__(self, items):
         """
         :param items: list of fields, links and singleton nodes
@@ -333,7 +347,7 @@ class Root(Node):
 
 
 class AbstractGraph(AbstractBase):
-    pass
+    __slots__ = ()
 
 
 class Graph(AbstractGraph):
@@ -348,6 +362,9 @@ class Graph(AbstractGraph):
         ])
 
     """
+    __slots__ = ('items', 'data_types', 'nodes', 'nodes_map', 'root',
+                 '__types__', '__weakref__')
+
     def __init__(self, items, data_types=None):
         """
         :param items: list of nodes
@@ -357,8 +374,15 @@ class Graph(AbstractGraph):
         GraphValidator.validate(items)
 
         self.items = GraphInit.init(items)
+        self.nodes = [e for e in self.items if e.name is not None]
+        self.nodes_map = {e.name: e for e in self.nodes}
         self.data_types = data_types or {}
         self.__types__ = GraphTypes.get_types(self.items, self.data_types)
+        root_fields = []
+        for node in self.items:
+            if node.name is None:
+                root_fields.extend(node.fields)
+        self.root = Root(root_fields)
 
     def __repr__(self):
         return '{}({!r})'.format(self.__class__.__name__, self.items)
@@ -374,18 +398,6 @@ class Graph(AbstractGraph):
             if node.name is not None:
                 yield node
 
-    @cached_property
-    def root(self):
-        return Root(list(self.iter_root()))
-
-    @cached_property
-    def nodes(self):
-        return list(self.iter_nodes())
-
-    @cached_property
-    def nodes_map(self):
-        return OrderedDict((e.name, e) for e in self.iter_nodes())
-
     def accept(self, visitor):
         return visitor.visit_graph(self)
 
@@ -424,6 +436,24 @@ class AbstractGraphVisitor(ABC):
 class GraphVisitor(AbstractGraphVisitor):
 
     def visit(self, obj):
+        # Exact-type dispatch saves the accept/visit_xxx round-trip for
+        # the common graph types; anything else (subclasses, directives)
+        # falls back to the accept protocol.  The table is built lazily,
+        # as subclasses are not required to call __init__.
+        try:
+            dispatch = self._dispatch
+        except AttributeError:
+            dispatch = self._dispatch = {
+                Option: self.visit_option,
+                Field: self.visit_field,
+                Link: self.visit_link,
+                Node: self.visit_node,
+                Root: self.visit_root,
+                Graph: self.visit_graph,
+            }
+        visit_method = dispatch.get(type(obj))
+        if visit_method is not None:
+            return visit_method(obj)
         return obj.accept(self)
 
     def visit_option(self, obj):
@@ -520,7 +550,7 @@ class GraphInit(GraphTransformer):
 class GraphTypes(GraphVisitor):
 
     def _visit_graph(self, items, data_types):
-        types = OrderedDict(data_types)
+        types = dict(data_types)
         roots = []
         for item in items:
             if item.name is not None:
@@ -650,19 +650,20 @@ class AddIntrospection(GraphTransformer):
         self.type_name_field_factory = type_name_field_factory
 
     def visit_node(self, obj):
-        node = super(AddIntrospection, self).visit_node(obj)
-        node.fields.append(self.type_name_field_factory(obj.name))
-        return node
+        fields = [self.visit(f) for f in obj.fields]
+        fields.append(self.type_name_field_factory(obj.name))
+        return Node(obj.name, fields, description=obj.description,
+                    directives=obj.directives)
 
     def visit_root(self, obj):
-        root = super(AddIntrospection, self).visit_root(obj)
-        root.fields.append(self.type_name_field_factory(QUERY_ROOT_NAME))
-        return root
+        fields = [self.visit(f) for f in obj.fields]
+        fields.append(self.type_name_field_factory(QUERY_ROOT_NAME))
+        return Root(fields)
 
     def visit_graph(self, obj):
-        graph = super(AddIntrospection, self).visit_graph(obj)
-        graph.items.extend(self.introspection_graph.items)
-        return graph
+        items = [self.visit(node) for node in obj.items]
+        items.extend(self.introspection_graph.items)
+        return Graph(items, data_types=obj.data_types)
 
 
 class GraphQLIntrospection(GraphTransformer):
@@ -701,14 +702,15 @@ class GraphQLIntrospection(GraphTransformer):
         return BindToSchema(self._schema).visit(GRAPH)
 
     def visit_node(self, obj):
-        node = super(GraphQLIntrospection, self).visit_node(obj)
-        node.fields.append(self.__type_name__(obj.name))
-        return node
+        fields = [self.visit(f) for f in obj.fields]
+        fields.append(self.__type_name__(obj.name))
+        return Node(obj.name, fields, description=obj.description,
+                    directives=obj.directives)
 
     def visit_root(self, obj):
-        root = super(GraphQLIntrospection, self).visit_root(obj)
-        root.fields.append(self.__type_name__(QUERY_ROOT_NAME))
-        return root
+        fields = [self.visit(f) for f in obj.fields]
+        fields.append(self.__type_name__(QUERY_ROOT_NAME))
+        return Root(fields)
 
     def visit_graph(self, obj):
         ValidateGraph.validate(obj)
@@ -3,6 +3,19 @@ import os.path
 
 from setuptools import setup, find_packages
 
+try:
+    from Cython.Build import cythonize
+except ImportError:
+    # Cython is optional: without it the pure-Python modules are used
+    ext_modules = []
+else:
+    # SDL export is CPU-bound interpreter work and benefits the most
+    # from being compiled
+    ext_modules = cythonize(
+        ['hiku/federation/sdl.py'],
+        language_level=3,
+    )
+
 
 with open(
     os.path.join(os.path.dirname(__file__), 'hiku', '__init__.py')
@@ -24,6 +37,7 @@ setup(
     author_email='vladimir@magamedov.com',
     url='https://github.com/vmagamedov/hiku',
     packages=find_packages(exclude=['test*']),
+    ext_modules=ext_modules,
     include_package_data=True,
     license='BSD-3-Clause',
     python_requires='>=3.6',
@@ -1,13 +1,16 @@
 from unittest import TestCase
 
+from graphql.language.printer import print_ast
+
 from hiku.federation.endpoint import FederatedGraphQLEndpoint
 from hiku.federation.engine import Engine
 from hiku.federation.introspection import FederatedGraphQLIntrospection
-from hiku.federation.sdl import print_sdl
+from hiku.federation.sdl import compile_sdl, get_ast, print_sdl
 from hiku.executors.sync import SyncExecutor
-from hiku.graph import apply
+from hiku.graph import apply, Graph, Node, Field, Root, Link, Option
+from hiku.types import Integer, Sequence, String, TypeRef, Optional
 
-from tests.test_federation.utils import GRAPH
+from tests.test_federation.utils import GRAPH, ids_resolver
 
 INTROSPECTED_GRAPH = apply(GRAPH, [
     FederatedGraphQLIntrospection(GRAPH),
@@ -91,3 +94,64 @@ class TestSDL(TestCase):
             '}'
         ]
         self.assertEqual(sdl.splitlines(), expected)
+
+    def test_compile_sdl(self):
+        emit = compile_sdl(GRAPH)
+        self.assertEqual(emit(), print_sdl(GRAPH))
+        # the second call hits the cache and returns the same string
+        self.assertIs(compile_sdl(GRAPH)(), emit())
+
+    def test_print_list_option_default(self):
+        graph = Graph([
+            Node('Cart', [
+                Field('id', Integer, ids_resolver),
+            ]),
+            Root([
+                Link('carts', Sequence[TypeRef['Cart']], lambda: [],
+                     requires=None,
+                     options=[Option('ids', Sequence[Integer],
+                                     default=[1, 2, 3])]),
+            ]),
+        ])
+        sdl = print_sdl(graph)
+        self.assertIn('carts(ids: [Int!]! = [1, 2, 3]): [Cart!]!', sdl)
+        self.assertEqual(sdl.strip(), print_ast(get_ast(graph)).strip())
+
+    def test_print_large_graph(self):
+        # more than _PARALLEL_EXPORT_THRESHOLD definitions, so the AST
+        # exporter takes the thread-pool branch; the string emitter is
+        # sequential, so comparing them checks content and order
+        graph = Graph([
+            Node('Node{}'.format(i), [
+                Field('id', Integer, ids_resolver),
+            ])
+            for i in range(40)
+        ] + [
+            Root([
+                Link('node0', TypeRef['Node0'], lambda: 1, requires=None),
+            ]),
+        ])
+        sdl = print_sdl(graph)
+        self.assertEqual(sdl.strip(), print_ast(get_ast(graph)).strip())
+        self.assertIn('type Node0 {', sdl)
+        self.assertIn('type Node39 {', sdl)
+
+    def test_print_option_descriptions(self):
+        graph = Graph([
+            Node('User', [
+                Field('id', Integer, ids_resolver),
+                Field('photo', Optional[String], ids_resolver, options=[
+                    Option('width', Integer, default=50, description='px'),
+                    Option('height', Integer),
+                ]),
+            ]),
+            Root([
+                Link('user', TypeRef['User'], lambda: 1, requires=None,
+                     options=[Option('id', Integer,
+                                     description='user identifier')]),
+            ]),
+        ])
+        sdl = print_sdl(graph)
+        self.assertEqual(sdl.strip(), print_ast(get_ast(graph)).strip())
+        self.assertIn('"px"', sdl)
+        self.assertIn('"user identifier"', sdl)